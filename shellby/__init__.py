@@ -1 +1 @@
-from .shell import bash
+from .shell import Command, bash, bash_many, clear_cache
@@ -1,13 +1,15 @@
 from dataclasses import dataclass
+from operator import attrgetter
 from typing import Union
 
 
 @dataclass
 class ShellResult:
+    __slots__ = ("returncode", "stdout", "stderr")
+
     returncode: int
     stdout: Union[str, bytes]
     stderr: Union[str, bytes]
 
-    @property
-    def code(self):
-        return self.returncode
\ No newline at end of file
+    # Backwards-compatible alias; attrgetter keeps the read at C level
+    code = property(attrgetter("returncode"))
\ No newline at end of file
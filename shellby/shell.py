@@ -1,5 +1,9 @@
 import asyncio
+import atexit
+import codecs
 import getpass
+import os
+import re
 import shlex
 import subprocess
 import sys
@@ -21,29 +25,61 @@ from .result import ShellResult
 
 PIPE = object()
 
+# StreamReader buffer size: large enough that each wakeup drains a full
+# pipe's worth of output rather than the 64KiB asyncio default.
+STREAM_LIMIT = 1 << 20
+
+# Results of bash(..., cache=True) calls, keyed on the full command line
+# plus everything else that could change its output.
+_CACHE_LIMIT = 1024
+_CACHE = {}
+
+
+def clear_cache():
+    _CACHE.clear()
+
+
 BOLD_CHECKMARK = "\u2714"
 BOLD_CROSS = "\u2718"
 
+# Computed once: getuser() hits the passwd database, and the status
+# symbols are constant strings.
+_CURRENT_USER = getpass.getuser()
+_OK_SYMBOL = white("[" + green(BOLD_CHECKMARK) + "]")
+_FAIL_SYMBOL = white("[" + red(BOLD_CROSS) + "]")
+
 
 class ShellException(Exception):
+    # Carries the failed result so callers can inspect stdout/stderr
+    # (e.g. `except ShellException as e: e.result.stderr`) without
+    # re-running the command.
     def __init__(self, result: ShellResult):
-        super().__init__("Process exit with code %d" % result.returncode)
+        self.result = result
+        super().__init__(f"Process exit with code {result.returncode}")
+
+
+# Arguments made up entirely of these characters need no quoting; mirrors
+# the character class shlex.quote treats as safe.
+_SAFE = re.compile(r"\A[\w@%+=:,./-]+\Z", re.ASCII).match
 
 
 def quote(value: Union[str, Path]) -> str:
     if isinstance(value, Path):
-        return shlex.quote(str(value))
-    elif type(value) in (bytes, str):
-        return shlex.quote(value)
-    else:
+        value = str(value)
+    elif type(value) not in (bytes, str):
         raise Exception("Invalid command line argument type: %s" % type(value))
+    if isinstance(value, str) and _SAFE(value):
+        return value
+    return shlex.quote(value)
 
 
 def join_command(args: List[Union[str, Path]]):
-    return " ".join([quote(arg) for arg in args])
+    return " ".join(quote(arg) for arg in args)
 
 
 class Command:
+    __slots__ = ("directory", "user", "string", "full", "_full_string")
+
     def __init__(self, command, *, user=None, directory=None):
         if type(command) in (list, tuple):
             command = join_command(command)
@@ -59,22 +95,65 @@ class Command:
         if user is not None:
             self.full = ["sudo", "--user=%s" % user, "--login"] + self.full
 
-        self.full_string = " ".join([quote(arg) for arg in self.full])
+        self._full_string = None
+
+    def __eq__(self, other):
+        return isinstance(other, Command) and self.full_string == other.full_string
+
+    def __hash__(self):
+        return hash(self.full_string)
+
+    @property
+    def full_string(self):
+        if self._full_string is None:
+            self._full_string = " ".join([quote(arg) for arg in self.full])
+        return self._full_string
+
+
+async def _gather_pair(first, second):
+    # TaskGroup cancels the sibling promptly when one stream reader
+    # fails; gather would leave it pending for the loop to clean up.
+    if hasattr(asyncio, "TaskGroup"):
+        try:
+            async with asyncio.TaskGroup() as group:
+                first_task = group.create_task(first)
+                second_task = group.create_task(second)
+        except BaseExceptionGroup as group_exc:
+            # Re-raise lone failures bare so callers catch the same
+            # exception types as the gather fallback raises
+            if len(group_exc.exceptions) == 1:
+                raise group_exc.exceptions[0] from None
+            raise
+        return (first_task.result(), second_task.result())
+    return await asyncio.gather(first, second)
 
 
 class OutputHandler:
+    __slots__ = (
+        "command",
+        "name",
+        "user",
+        "is_current_user",
+        "capture",
+        "display",
+        "prefix",
+        "quiet",
+        "_prefix_bytes",
+    )
+
     def __init__(
         self, name: str, command, prefix=True, capture=True, display=True, quiet=False
     ):
         self.command = command
         self.name = name
         self.user = command.user
-        self.is_current_user = self.user == getpass.getuser()
+        self.is_current_user = self.user == _CURRENT_USER
 
         self.capture = capture
         self.display = display
         self.prefix = prefix
         self.quiet = quiet
+        self._prefix_bytes = (name or "").encode("utf-8")
 
     def open(self):
         if not self.quiet:
@@ -83,21 +162,34 @@ class OutputHandler:
                 symbol="#" if self.user == "root" else "$",
             )
 
+        if not (self.capture or self.display):
+            # Nobody will read the output; don't even open the pipes
+            return (subprocess.DEVNULL, subprocess.DEVNULL)
         return (subprocess.PIPE, subprocess.PIPE)
 
     async def _read_encoded(self, stream):
         if stream is None:
             return None
-        data = await stream.read()
-        return data.decode("utf-8")
+        # Drain in large chunks, decoding incrementally as they arrive: no
+        # giant intermediate bytes object, and multibyte characters split
+        # across chunk boundaries decode correctly.
+        decoder = codecs.getincrementaldecoder("utf-8")()
+        parts = []
+        while True:
+            chunk = await stream.read(STREAM_LIMIT)
+            if not chunk:
+                parts.append(decoder.decode(b"", final=True))
+                break
+            parts.append(decoder.decode(chunk))
+        return "".join(parts)
 
     async def collect(self, stdout_stream, stderr_stream):
         if not self.display:
-            return await asyncio.gather(
+            return await _gather_pair(
                 self._read_encoded(stdout_stream), self._read_encoded(stderr_stream)
             )
 
-        return await asyncio.gather(
+        return await _gather_pair(
             self._tail_stream(">", stdout_stream),
             self._tail_stream(">", stderr_stream),
         )
@@ -105,56 +197,78 @@ class OutputHandler:
     def close(self, return_code):
         if self.quiet:
             return
-        symbol = white(
-            "[" + (green(BOLD_CHECKMARK) if return_code == 0 else red(BOLD_CROSS)) + "]"
-        )
-
         if return_code == 0:
-            self.print("", symbol=symbol)
+            self.print("", symbol=_OK_SYMBOL)
         else:
-            self.print("exit with %d" % return_code)
+            self.print("exit with %d" % return_code, symbol=_FAIL_SYMBOL)
 
     def exception(self, exc):
         self.print(red("[ERR!]", bold=True) + " " + str(exc))
 
     def print(self, string, symbol=":"):
-        print(
-            "%s%s %s" % (self.name if self.name else "", symbol, string),
-            file=sys.stderr,
+        if self.quiet:
+            return
+        # One unbuffered write straight to the fd; skips the print()
+        # machinery and the text layer's re-encode on every line.
+        sys.stderr.buffer.write(
+            self._prefix_bytes
+            + symbol.encode("utf-8")
+            + b" "
+            + string.encode("utf-8", "replace")
+            + b"\n"
         )
 
     async def _tail_stream(self, symbol, stream):
         if stream is None:
             return None
 
-        # Don't write blank lines at the end
-        line = True
-        captured = []
+        # Read in bulk and split lines in memory: each wakeup drains up to
+        # a full reader buffer rather than a single line.
+        captured = bytearray()
         empty_lines = 0
+        buf = bytearray()
+
+        # The per-line path skips print(): encode the prefix once and emit
+        # each line as a single buffer.write().
+        write = None if self.quiet else sys.stderr.buffer.write
+        line_prefix = self._prefix_bytes + symbol.encode("utf-8") + b" "
+        blank_line = line_prefix + b"\n"
 
-        while line:
-            line_promise = stream.readline()
-            line_data = await line_promise
-
-            # @TODO: give warnings if no data is coming in
-            # while True:
-            #   try:
-            #     line_data = await wait_for(shield(line_promise), 15)
-            #     break
-            #   except asyncio.TimeoutError:
-            #     sys.stderr.write(prefix + red('no output after 15s'))
-
-            line = line_data.decode("utf-8")
-            if self.capture:
-                captured.append(line)
-            if not line.strip():
-                empty_lines += 1
+        # @TODO: give warnings if no data is coming in
+
+        while True:
+            chunk = await stream.read(STREAM_LIMIT)
+            if not chunk:
+                lines = buf.decode("utf-8", "replace").splitlines() if buf else []
             else:
-                for index in range(empty_lines):
-                    self.print("", symbol=symbol)
-                self.print(line.rstrip(), symbol=symbol)
+                if self.capture:
+                    captured.extend(chunk)
+                buf += chunk
+                newline = buf.rfind(b"\n")
+                if newline < 0:
+                    continue
+                # splitlines() is a single C call over the whole block
+                lines = buf[: newline + 1].decode("utf-8", "replace").splitlines()
+                del buf[: newline + 1]
+
+            # Don't write blank lines at the end
+            for line in lines:
+                if not line.strip():
+                    empty_lines += 1
+                    continue
+                if write is not None:
+                    for index in range(empty_lines):
+                        write(blank_line)
+                    write(
+                        line_prefix
+                        + line.rstrip().encode("utf-8", "replace")
+                        + b"\n"
+                    )
                 empty_lines = 0
-        return "".join(captured) if self.capture else None
+
+            if not chunk:
+                break
+        return captured.decode("utf-8", "replace") if self.capture else None
 
 
 async def bash_async(
@@ -167,16 +281,22 @@ async def bash_async(
     stdin=None,
     cwd=None,
     check=True,
+    capture=True,
     display=True,
     quiet=False,
+    cache=False,
 ):
     assert type(stdin) in (type(None), bytes, str), "restrictions for now"
 
-    command = Command(command)
+    # A pre-built Command can be reused across calls (retries, sweeps)
+    # without re-quoting its argv every time
+    if not isinstance(command, Command):
+        command = Command(command, user=user)
     if output is None:
         output = OutputHandler(
             command=command,
             name=name,
+            capture=capture,
             display=display,
             quiet=quiet,
         )
@@ -184,34 +304,112 @@ async def bash_async(
     if type(stdin) is str:
         stdin = stdin.encode("utf-8")
 
+    if cwd and not (isinstance(cwd, str) and cwd.startswith("/")):
+        # Absolute string paths (the common case) skip the Path round-trip
+        cwd = str(Path(cwd).expanduser())
+
+    if cache and not output.capture:
+        # A non-capturing run produces an empty ShellResult; caching it
+        # would serve that emptiness to later capturing callers
+        cache = False
+
+    if cache:
+        # Opt-in: only sensible for commands whose output is deterministic
+        cache_key = (command.full_string, stdin, cwd, user)
+        cached = _CACHE.get(cache_key)
+        if cached is not None:
+            return ShellResult(cached.returncode, cached.stdout, cached.stderr)
+
     (stdout, stderr) = output.open()
-    proc = await asyncio.create_subprocess_shell(
-        command.full_string,
+    # exec the argv directly: no extra /bin/sh layer, no re-quoting
+    proc = await asyncio.create_subprocess_exec(
+        *command.full,
         stdin=subprocess.PIPE if stdin else None,
         stdout=stdout,
         stderr=stderr,
-        cwd=Path(cwd).expanduser() if cwd else None,
+        cwd=cwd or None,
+        limit=STREAM_LIMIT,
     )
 
-    collect_promise = output.collect(proc.stdout, proc.stderr)
-
-    if stdin:
-        proc.stdin.write(stdin)
-        await proc.stdin.drain()
+    async def _feed_stdin():
+        # Write in pipe-sized chunks, draining as we go, so a child that is
+        # busy producing output can't deadlock us on a full stdin pipe.
+        for offset in range(0, len(stdin), 1 << 16):
+            proc.stdin.write(stdin[offset : offset + (1 << 16)])
+            await proc.stdin.drain()
         proc.stdin.close()
 
-    (stdout, stderr) = await collect_promise
+    async def _noop():
+        return None
+
+    needs_streams = output.capture or output.display
+    (_, collected) = await asyncio.gather(
+        _feed_stdin() if stdin else _noop(),
+        output.collect(proc.stdout, proc.stderr) if needs_streams else _noop(),
+    )
+    (stdout, stderr) = collected if collected is not None else ("", "")
     await proc.wait()
     output.close(proc.returncode)
 
     result = ShellResult(proc.returncode, stdout, stderr)
     if check and result.returncode != 0:
         raise ShellException(result)
+    if cache and result.returncode == 0:
+        if len(_CACHE) >= _CACHE_LIMIT:
+            _CACHE.pop(next(iter(_CACHE)))
+        _CACHE[cache_key] = result
     return result
 
 
+async def bash_many_async(commands, *, concurrency: Optional[int] = None, **kw):
+    # Fan commands out under a bounded semaphore so N independent commands
+    # run in roughly max(T_i) rather than sum(T_i).
+    if concurrency is None:
+        concurrency = os.cpu_count() or 4
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(command):
+        async with semaphore:
+            return await bash_async(command, **kw)
+
+    return await asyncio.gather(*(_one(command) for command in commands))
+
+
+class _LoopRunner:
+    # Minimal stand-in for asyncio.Runner on Python < 3.11
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+
+    def run(self, coro):
+        return self._loop.run_until_complete(coro)
+
+    def close(self):
+        self._loop.close()
+
+
+_runner = None
+
+
+def _get_runner():
+    # Reuse one event loop across bash() calls rather than paying for
+    # asyncio.run()'s loop setup/teardown on every invocation.
+    global _runner
+    if _runner is None:
+        _runner = asyncio.Runner() if hasattr(asyncio, "Runner") else _LoopRunner()
+        atexit.register(_runner.close)
+    return _runner
+
+
 def bash(command: Union[str, List[str]], wait=True, **kw):
+    # Not re-entrant from within a running event loop; use bash_async there.
     coro = bash_async(command, **kw)
     if not wait:
         return coro
-    return asyncio.run(coro)
+    return _get_runner().run(coro)
+
+
+def bash_many(commands: List[Union[str, List[str]]], wait=True, **kw):
+    coro = bash_many_async(commands, **kw)
+    if not wait:
+        return coro
+    return _get_runner().run(coro)